@@ -2,12 +2,21 @@
 # -*- coding: utf-8 -*-
 
 import argparse
+import io
+import os
 import pathlib
 import re
-from typing import List, Sequence, Tuple
+import stat
+from typing import List, Sequence, TextIO, Tuple
 
 CHINESE_DIGITS: Tuple[str, ...] = ("", "一", "二", "三", "四", "五", "六", "七", "八", "九")
 
+DATE_PREFIX_RE = re.compile(r"^(\d+月\d+日|近日|昨日|今日)")
+NUMBER_PREFIX_RE = re.compile(r"^([一二三四五六七八九十]+|\d+)、")
+# 首字符预筛：不可能命中上述正则的行直接跳过匹配
+DATE_PREFIX_CHARS = frozenset("近昨今")
+NUMBER_PREFIX_CHARS = frozenset("一二三四五六七八九十")
+
 
 def chinese_number(num: int) -> str:
     """将阿拉伯数字转换为中文数词。"""
@@ -24,97 +33,102 @@ def chinese_number(num: int) -> str:
     return str(num)
 
 
-def number_news_items(lines: Sequence[str]) -> Tuple[List[str], int]:
-    """Return updated lines with Chinese numbering and count of items changed."""
-    new_lines: List[str] = []
+def _line_end(text: str, start: int) -> int:
+    """返回从 start 开始的一行（含换行符）的结束下标。"""
+    end = text.find("\n", start)
+    return len(text) if end == -1 else end + 1
+
+
+def number_news_items(text: str, out: TextIO) -> Tuple[bool, int]:
+    """Write numbered text to out; return whether any line changed and items numbered.
+
+    Lines are located by offset (split on "\\n") rather than materialised as a
+    list, so only the current line and its successor are sliced at a time.
+    """
+    # 循环内频繁调用，预先绑定方法避免逐行属性查找
+    write = out.write
+    match_date = DATE_PREFIX_RE.match
     news_counter = 0
     added_count = 0
-    i = 0
-    total_lines = len(lines)
-
-    while i < total_lines:
-        raw_line = lines[i]
+    changed = False
+    text_length = len(text)
+    line_index = 0
+    start = 0
+    end = _line_end(text, 0)
+
+    while start < text_length:
+        # 下一行为 text[end:next_end]；当前行为最后一行时 next_end == end
+        next_end = _line_end(text, end)
+        raw_line = text[start:end]
         stripped_line = raw_line.strip()
+        first_char = stripped_line[:1]
 
-        if i < 5:
-            new_lines.append(raw_line)
-            i += 1
-            continue
-
-        if stripped_line.startswith("【"):
-            new_lines.append(raw_line)
+        if line_index < 5 or not stripped_line:
+            write(raw_line)
+        elif first_char == "【":
+            write(raw_line)
             news_counter = 0
-            i += 1
-            continue
-
-        if not stripped_line:
-            new_lines.append(raw_line)
-            i += 1
-            continue
-
-        is_news_title = False
-        if i + 1 < total_lines:
-            next_line = lines[i + 1].strip()
-            if next_line and len(next_line) > 50 and not next_line.startswith("【"):
-                if not re.match(r"^(\d+月\d+日|近日|昨日|今日)", stripped_line):
-                    is_news_title = True
-
-        if is_news_title:
-            news_counter += 1
-
-            # 检查是否已有序号前缀
-            existing_number_match = re.match(r"^([一二三四五六七八九十]+|\d+)、", stripped_line)
-
-            # 总是重新编号（无论是否已有序号）
-            if raw_line.endswith("\r\n"):
-                newline = "\r\n"
-            elif raw_line.endswith("\n"):
-                newline = "\n"
-            elif raw_line.endswith("\r"):
-                newline = "\r"
-            else:
-                newline = "\n"
-
-            # 移除原有的序号前缀（如果存在）
-            if existing_number_match:
-                content_start = existing_number_match.end()
-                content = stripped_line[content_start:]
-            else:
-                content = stripped_line
-                added_count += 1
-
-            numbered_line = f"{chinese_number(news_counter)}、{content}{newline}"
-            new_lines.append(numbered_line)
         else:
-            new_lines.append(raw_line)
+            is_news_title = False
+            if end < text_length:
+                next_line = text[end:next_end].strip()
+                if len(next_line) > 50 and next_line[0] != "【":
+                    if not (
+                        (first_char in DATE_PREFIX_CHARS or first_char.isdecimal())
+                        and match_date(stripped_line)
+                    ):
+                        is_news_title = True
+
+            if is_news_title:
+                news_counter += 1
+
+                # 检查是否已有序号前缀
+                existing_number_match = None
+                if first_char in NUMBER_PREFIX_CHARS or first_char.isdecimal():
+                    existing_number_match = NUMBER_PREFIX_RE.match(stripped_line)
+
+                # 总是重新编号（无论是否已有序号）
+                newline = raw_line[len(raw_line.rstrip("\r\n")):] or "\n"
+
+                # 移除原有的序号前缀（如果存在）
+                if existing_number_match:
+                    content_start = existing_number_match.end()
+                    content = stripped_line[content_start:]
+                else:
+                    content = stripped_line
+                    added_count += 1
+
+                numbered_line = f"{chinese_number(news_counter)}、{content}{newline}"
+                write(numbered_line)
+                if numbered_line != raw_line:
+                    changed = True
+            else:
+                write(raw_line)
 
-        i += 1
+        start, end = end, next_end
+        line_index += 1
 
-    return new_lines, added_count
+    return changed, added_count
 
 
-def process_file(path: pathlib.Path, dry_run: bool) -> Tuple[bool, int]:
-    """Process a single file and return (changed flag, items updated)."""
+def process_file(path: pathlib.Path, dry_run: bool) -> Tuple[bool, int, str]:
+    """Process a single file and return (changed flag, items updated, status line)."""
     try:
         original_content = path.read_text(encoding="utf-8")
     except UnicodeDecodeError:
-        print(f"[skip] {path} (encoding not utf-8)")
-        return False, 0
+        return False, 0, f"[skip] {path} (encoding not utf-8)"
 
-    original_lines = original_content.splitlines(keepends=True)
-    new_lines, added_count = number_news_items(original_lines)
+    buffer = io.StringIO()
+    changed, added_count = number_news_items(original_content, buffer)
 
-    if new_lines == original_lines:
-        print(f"[ok]   {path} (no change)")
-        return False, 0
+    if not changed:
+        return False, 0, f"[ok]   {path} (no change)"
 
     if dry_run:
-        print(f"[dry]  {path} (would add numbers to {added_count} item(s))")
-        return True, added_count
+        return True, added_count, f"[dry]  {path} (would add numbers to {added_count} item(s))"
 
-    path.write_text("".join(new_lines), encoding="utf-8")
-    print(f"[edit] {path} (added numbers to {added_count} item(s))")
-    return True, added_count
+    path.write_text(buffer.getvalue(), encoding="utf-8")
+    return True, added_count, f"[edit] {path} (added numbers to {added_count} item(s))"
 
 
 def collect_txt_files(targets: Sequence[pathlib.Path]) -> List[pathlib.Path]:
@@ -122,7 +136,17 @@ def collect_txt_files(targets: Sequence[pathlib.Path]) -> List[pathlib.Path]:
     seen = set()
 
     for target in targets:
-        if target.is_file():
+        # 每个目标只 stat 一次，再按文件类型分支
+        try:
+            mode = os.stat(target).st_mode
+        except OSError as exc:
+            print(f"[skip] {target} ({exc.strerror})")
+            continue
+        except ValueError as exc:
+            print(f"[skip] {target} (invalid path: {exc})")
+            continue
+
+        if stat.S_ISREG(mode):
             if target.suffix.lower() == ".txt":
                 if target not in seen:
                     files.append(target)
@@ -131,14 +155,25 @@ def collect_txt_files(targets: Sequence[pathlib.Path]) -> List[pathlib.Path]:
                 print(f"[skip] {target} (not a .txt file)")
             continue
 
-        if target.is_dir():
-            for candidate in sorted(p for p in target.glob("*.txt") if p.is_file()):
+        if stat.S_ISDIR(mode):
+            try:
+                with os.scandir(target) as entries:
+                    names = sorted(
+                        entry.name
+                        for entry in entries
+                        if entry.name.lower().endswith(".txt") and entry.is_file()
+                    )
+            except OSError as exc:
+                print(f"[skip] {target} (cannot list directory: {exc.strerror})")
+                continue
+            for name in names:
+                candidate = target / name
                 if candidate not in seen:
                     files.append(candidate)
                     seen.add(candidate)
             continue
 
-        print(f"[skip] {target} (path does not exist)")
+        print(f"[skip] {target} (not a file or directory)")
 
     return files
 
@@ -169,7 +204,8 @@ def main() -> None:
     changed_files = 0
     total_numbered = 0
     for file_path in txt_files:
-        changed, added = process_file(file_path, args.dry_run)
+        changed, added, message = process_file(file_path, args.dry_run)
+        print(message)
         if changed:
             changed_files += 1
             total_numbered += added
@@ -7,43 +7,46 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import os
 import re
+import sys
 from collections import OrderedDict, defaultdict
+from operator import itemgetter
 from pathlib import Path
-from typing import Dict, Iterable, List, Mapping
+from typing import Collection, Dict, Iterable, List, Mapping, Tuple
 
+FILENAME_PREFIX = "high_score_summaries_"
 FILENAME_RE = re.compile(r"^high_score_summaries_(\d{4}_\d{2}_\d{2})\((\d+)\)\.txt$")
+IO_BUFFER_SIZE = 128 * 1024  # Fewer read/write syscalls than the 8 KiB default.
 ALLOWED_CATEGORIES = {
     "【\u4eac\u5185\u6b63\u9762】",
     "【\u4eac\u5185\u8d1f\u9762】",
     "【\u4eac\u5916\u6b63\u9762】",
     "【\u4eac\u5916\u8d1f\u9762】",
 }
-CATEGORY_HEADER_RE = re.compile(
-    r"^(【\u4eac\u5185\u6b63\u9762】|【\u4eac\u5185\u8d1f\u9762】|【\u4eac\u5916\u6b63\u9762】|【\u4eac\u5916\u8d1f\u9762】)"
-)
-ANY_HEADER_RE = re.compile(r"^【[^】]+】")
 
 
 def find_segment_files(root: Path) -> Mapping[str, List[Path]]:
-    grouped: Dict[str, List[Path]] = defaultdict(list)
-    for entry in root.iterdir():
-        if not entry.is_file():
-            continue
-        match = FILENAME_RE.match(entry.name)
-        if not match:
-            continue
-        grouped[match.group(1)].append(entry)
-    for paths in grouped.values():
-        paths.sort(key=_segment_sort_key)
+    # Keep the segment number from the filename match so sorting needs no re-match.
+    numbered: Dict[str, List[Tuple[int, Path]]] = defaultdict(list)
+    match_filename = FILENAME_RE.match  # Bound once; looked up per directory entry otherwise.
+    with os.scandir(root) as entries:
+        for entry in entries:
+            name = entry.name
+            # Cheap prefix/suffix test first; the regex and the stat only run for likely names.
+            if not (name.startswith(FILENAME_PREFIX) and name.endswith(".txt")):
+                continue
+            match = match_filename(name)
+            if not match or not entry.is_file():
+                continue
+            numbered[match.group(1)].append((int(match.group(2)), root / name))
+    grouped: Dict[str, List[Path]] = {}
+    for date_key, segments in numbered.items():
+        segments.sort(key=itemgetter(0))
+        grouped[date_key] = [path for _, path in segments]
     return grouped
 
 
-def _segment_sort_key(path: Path) -> int:
-    match = FILENAME_RE.match(path.name)
-    return int(match.group(2)) if match else 0
-
-
 def parse_summary_file(path: Path) -> "OrderedDict[str, List[str]]":
     categories: "OrderedDict[str, List[str]]" = OrderedDict()
     current_label: str | None = None
@@ -57,19 +60,20 @@ def parse_summary_file(path: Path) -> "OrderedDict[str, List[str]]":
             categories.setdefault(current_label, []).append(entry_text)
         current_lines.clear()
 
-    with path.open("r", encoding="utf-8") as handle:
+    with path.open("r", encoding="utf-8", buffering=IO_BUFFER_SIZE) as handle:
         for raw_line in handle:
             stripped = raw_line.strip()
-            header_match = CATEGORY_HEADER_RE.match(stripped)
-            if header_match:
-                flush_entry()
-                current_label = header_match.group(1)
-                categories.setdefault(current_label, [])
-                continue
-            if ANY_HEADER_RE.match(stripped):
-                flush_entry()
-                current_label = None  # Ignore categories not in the allowlist.
-                continue
+            if stripped.startswith("【"):
+                end = stripped.find("】")
+                if end > 1:
+                    flush_entry()
+                    label = stripped[: end + 1]
+                    if label in ALLOWED_CATEGORIES:
+                        current_label = label
+                        categories.setdefault(current_label, [])
+                    else:
+                        current_label = None  # Ignore categories not in the allowlist.
+                    continue
             if current_label is None:
                 continue
             if stripped == "":
@@ -89,17 +93,62 @@ def merge_categories(parsed_files: Iterable["OrderedDict[str, List[str]]"]) -> "
     return merged
 
 
-def write_merged_file(categories: "OrderedDict[str, List[str]]", output_path: Path) -> None:
-    with output_path.open("w", encoding="utf-8", newline="\n") as handle:
-        first_category = True
-        for label, entries in categories.items():
-            if not first_category:
-                handle.write("\n")
-            first_category = False
-            handle.write(f"{label}：{len(entries)} 条\n\n")
-            for entry in entries:
-                handle.write(entry.rstrip())
-                handle.write("\n\n")
+def write_merged_file(categories: Mapping[str, Collection[str]], output_path: Path) -> None:
+    chunks: List[str] = []
+    for label, entries in categories.items():
+        if chunks:
+            chunks.append("\n")
+        chunks.append(f"{label}：{len(entries)} 条\n\n")
+        for entry in entries:
+            chunks.append(entry.rstrip())
+            chunks.append("\n\n")
+    with output_path.open("w", encoding="utf-8", newline="\n", buffering=IO_BUFFER_SIZE) as handle:
+        handle.writelines(chunks)
+
+
+def merge_group(
+    date_key: str, paths: List[Path], *, root: Path, suffix: str, delete_sources: bool
+) -> List[str]:
+    """Merge one date's segment files; return the report lines for it."""
+    messages: List[str] = []
+    output_path = root / f"high_score_summaries_{date_key}{suffix}.txt"
+    existing_categories: "OrderedDict[str, List[str]]" = (
+        parse_summary_file(output_path) if output_path.exists() else OrderedDict()
+    )
+
+    parsed = [parse_summary_file(path) for path in paths]
+    new_categories = merge_categories(parsed)
+    if not new_categories:
+        messages.append(f"[{date_key}] Skipped: no categories detected.")
+        return messages
+
+    # Append new entries while keeping existing content and avoiding duplicates.
+    # Dict keys double as an insertion-ordered set, so each entry is hashed once.
+    updated: Dict[str, Dict[str, None]] = {}
+    for label, entries in existing_categories.items():
+        updated[label] = dict.fromkeys(entries)
+
+    for label, entries in new_categories.items():
+        if entries:
+            updated.setdefault(label, {}).update(dict.fromkeys(entries))
+
+    if not updated:
+        messages.append(f"[{date_key}] Skipped: no content to write.")
+        return messages
+
+    write_merged_file(updated, output_path)
+    messages.append(
+        f"[{date_key}] Updated {output_path.name} "
+        f"(existing categories: {len(existing_categories)}, added parts: {len(paths)})."
+    )
+
+    if delete_sources:
+        for src in paths:
+            try:
+                src.unlink()
+            except OSError as exc:
+                messages.append(f"[{date_key}] Warning: failed to delete {src.name}: {exc}")
+    return messages
 
 
 def merge_all(root: Path, suffix: str, delete_sources: bool) -> None:
@@ -109,44 +158,9 @@ def merge_all(root: Path, suffix: str, delete_sources: bool) -> None:
         return
 
     for date_key, paths in sorted(groups.items()):
-        output_path = root / f"high_score_summaries_{date_key}{suffix}.txt"
-        existing_categories: "OrderedDict[str, List[str]]" = (
-            parse_summary_file(output_path) if output_path.exists() else OrderedDict()
-        )
-
-        parsed = [parse_summary_file(path) for path in paths]
-        new_categories = merge_categories(parsed)
-        if not new_categories:
-            print(f"[{date_key}] Skipped: no categories detected.")
-            continue
-
-        # Append new entries while keeping existing content and avoiding duplicates.
-        updated: "OrderedDict[str, List[str]]" = OrderedDict()
-        for label, entries in existing_categories.items():
-            updated[label] = list(entries)
-
-        for label, entries in new_categories.items():
-            existing_set = set(updated.get(label, []))
-            additions = [entry for entry in entries if entry not in existing_set]
-            if additions:
-                updated.setdefault(label, []).extend(additions)
-
-        if not updated:
-            print(f"[{date_key}] Skipped: no content to write.")
-            continue
-
-        write_merged_file(updated, output_path)
-        print(
-            f"[{date_key}] Updated {output_path.name} "
-            f"(existing categories: {len(existing_categories)}, added parts: {len(paths)})."
-        )
-
-        if delete_sources:
-            for src in paths:
-                try:
-                    src.unlink()
-                except OSError as exc:
-                    print(f"[{date_key}] Warning: failed to delete {src.name}: {exc}")
+        messages = merge_group(date_key, paths, root=root, suffix=suffix, delete_sources=delete_sources)
+        # One write per date instead of a print (and stdout lock) per line.
+        sys.stdout.write("\n".join(messages) + "\n")
 
 
 def main() -> None:
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import argparse
 import re
-from collections import defaultdict
+from itertools import chain
 from pathlib import Path
 from typing import Dict, Iterable, List, Sequence, Tuple
 
@@ -55,73 +55,76 @@ CATEGORY_RULES: Sequence[Tuple[str, Tuple[str, ...]]] = (
 
 DEFAULT_CATEGORY = "其他"
 CATEGORY_ORDER: Tuple[str, ...] = tuple(rule[0] for rule in CATEGORY_RULES) + (DEFAULT_CATEGORY,)
+CATEGORY_INDEX: Dict[str, int] = {category: index for index, category in enumerate(CATEGORY_ORDER)}
+# One alternation per category: a single scan finds any of its keywords,
+# while checking categories in rule order keeps the priority intact.
+CATEGORY_PATTERNS: Sequence[Tuple[str, "re.Pattern[str]"]] = tuple(
+    (category, re.compile("|".join(re.escape(keyword.lower()) for keyword in keywords)))
+    for category, keywords in CATEGORY_RULES
+)
 
 
 def classify_category(*parts: str) -> str:
-    haystack = " ".join(filter(None, parts)).lower()
-    for category, keywords in CATEGORY_RULES:
-        for keyword in keywords:
-            if keyword.lower() in haystack:
-                return category
+    if len(parts) == 1:
+        haystack = parts[0].lower()
+    else:
+        haystack = " ".join(filter(None, parts)).lower()
+    for category, pattern in CATEGORY_PATTERNS:
+        if pattern.search(haystack):
+            return category
     return DEFAULT_CATEGORY
 
 
 def split_sections(text: str) -> Tuple[str, List[Tuple[str, List[str]]]]:
-    pattern = re.compile(r"(^【[^】]+】)", re.MULTILINE)
-    matches = list(pattern.finditer(text))
-
-    if not matches:
-        header = text.strip("\n")
-        return header, []
+    """Split text into its header and (heading, entries) sections in one pass.
 
-    header = text[: matches[0].start()].strip("\n")
+    A heading is a line starting with 【…】; anything after the closing
+    bracket on that line belongs to the section body. Entries are runs of
+    non-blank lines separated by blank lines.
+    """
+    header_lines: List[str] = []
     sections: List[Tuple[str, List[str]]] = []
-
-    for index, match in enumerate(matches):
-        start = match.end()
-        end = matches[index + 1].start() if index + 1 < len(matches) else len(text)
-        heading = match.group(1).strip()
-        body = text[start:end].strip("\n")
-        entries = _split_entries(body)
-        sections.append((heading, entries))
-
-    return header, sections
-
-
-def _split_entries(body: str) -> List[str]:
     entries: List[str] = []
     buffer: List[str] = []
-    for line in body.splitlines():
-        if line.strip():
+
+    for line in text.split("\n"):
+        if line.startswith("【"):
+            end = line.find("】")
+            if end > 1:
+                if buffer:
+                    entries.append("\n".join(buffer))
+                    buffer = []
+                entries = []
+                sections.append((line[: end + 1], entries))
+                line = line[end + 1 :]
+        if not sections:
+            header_lines.append(line)
+        elif line.strip():
             buffer.append(line.rstrip())
-            continue
-        if buffer:
-            entries.append("\n".join(buffer).strip("\n"))
+        elif buffer:
+            entries.append("\n".join(buffer))
             buffer = []
     if buffer:
-        entries.append("\n".join(buffer).strip("\n"))
-    return entries
+        entries.append("\n".join(buffer))
 
+    return "\n".join(header_lines).strip("\n"), sections
 
-def reorder_entries(entries: Iterable[str]) -> Tuple[List[str], Dict[str, int]]:
-    buckets: Dict[str, List[str]] = {category: [] for category in CATEGORY_ORDER}
-    counts: Dict[str, int] = defaultdict(int)
 
+def reorder_entries(entries: Iterable[str]) -> Tuple[List[str], Dict[str, int]]:
+    buckets: List[List[str]] = [[] for _ in CATEGORY_ORDER]
     for entry in entries:
-        category = classify_category(entry)
-        buckets[category].append(entry)
-        counts[category] += 1
+        buckets[CATEGORY_INDEX[classify_category(entry)]].append(entry)
 
-    ordered: List[str] = []
-    for category in CATEGORY_ORDER:
-        ordered.extend(buckets[category])
+    ordered = list(chain.from_iterable(buckets))
+    counts = {category: len(bucket) for category, bucket in zip(CATEGORY_ORDER, buckets)}
     return ordered, counts
 
 
 def build_output(header: str, sections: List[Tuple[str, List[str]]]) -> str:
     parts: List[str] = []
-    if header.strip():
-        parts.append(header.strip())
+    header = header.strip()
+    if header:
+        parts.append(header)
     for heading, entries in sections:
         parts.append(heading.strip())
         parts.extend(entry.strip() for entry in entries)
@@ -157,13 +160,11 @@ def main(argv: Sequence[str] | None = None) -> None:
     reordered_sections: List[Tuple[str, List[str]]] = []
     for heading, entries in sections:
         normalized_heading = heading.replace("�", "").replace("?", "")
+        ordered_entries, counts = reorder_entries(entries)
         if "舆情参考" in normalized_heading or "舆情参" in normalized_heading:
-            counts: Dict[str, int] = defaultdict(int)
-            for entry in entries:
-                counts[classify_category(entry)] += 1
+            # Keep the original order here; the classification is only reported.
             reordered_sections.append((heading, entries))
         else:
-            ordered_entries, counts = reorder_entries(entries)
             reordered_sections.append((heading, ordered_entries))
         breakdown = ", ".join(f"{category}:{counts.get(category, 0)}" for category in CATEGORY_ORDER)
         print(f"{heading} -> {breakdown}")
@@ -171,6 +172,10 @@ def main(argv: Sequence[str] | None = None) -> None:
     output_path = args.output or input_path
 
     output_text = build_output(header, reordered_sections)
+    if output_path == input_path and output_text == text:
+        # Re-runs on an already ordered brief leave the file untouched.
+        print(f"Already in order, left unchanged: {output_path}")
+        return
     output_path.write_text(output_text, encoding="utf-8")
 
     print(f"Wrote reordered content to: {output_path}")